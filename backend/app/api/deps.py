@@ -8,7 +8,7 @@ from ..models import User
 
 oauth2_scheme = OAuth2PasswordBearer(tokenUrl="token")
 
-async def get_current_user(
+def get_current_user(
     token: str = Depends(oauth2_scheme),
     db: Session = Depends(get_db)
 ) -> User:
@@ -23,7 +23,7 @@ async def get_current_user(
     if user_id is None:
         raise credentials_exception
         
-    user = db.query(User).filter(User.id == user_id).first()
+    user = db.get(User, user_id)
     if user is None:
         raise credentials_exception
         
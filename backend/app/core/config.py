@@ -1,24 +1,42 @@
 import os
-from typing import List
+from dataclasses import dataclass, field
+from typing import List, Optional
 
+def _required_env(name: str) -> str:
+    """Return an environment variable, failing on a missing or empty value."""
+    value = os.getenv(name)
+    if not value:
+        raise RuntimeError(f"{name} must be set to a non-empty value")
+    return value
+
+@dataclass(frozen=True, slots=True)
 class Settings:
     PROJECT_NAME: str = "User Management API"
     VERSION: str = "1.0.0"
     API_V1_STR: str = ""
-    
+
     # CORS Settings
-    CORS_ORIGINS: List[str] = os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
-    
+    CORS_ORIGINS: List[str] = field(
+        default_factory=lambda: os.getenv("CORS_ORIGINS", "http://localhost:3000").split(",")
+    )
+
     # Database Settings
-    DATABASE_URL: str = os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/userdb")
-    
-    # Authentication Settings
-    JWT_SECRET_KEY: str = os.getenv("JWT_SECRET_KEY")
+    DATABASE_URL: str = field(
+        default_factory=lambda: os.getenv("DATABASE_URL", "postgresql://postgres:postgres@db:5432/userdb")
+    )
+
+    # Create missing tables on startup instead of running `python -m app.init_db`
+    AUTO_CREATE_TABLES: bool = field(
+        default_factory=lambda: os.getenv("AUTO_CREATE_TABLES", "").lower() in ("1", "true", "yes")
+    )
+
+    # Authentication Settings (required: fail at startup rather than on first token)
+    JWT_SECRET_KEY: str = field(default_factory=lambda: _required_env("JWT_SECRET_KEY"))
     JWT_ALGORITHM: str = "HS256"
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
-    
+
     # Google OAuth Settings
-    GOOGLE_CLIENT_ID: str = os.getenv("GOOGLE_CLIENT_ID")
-    GOOGLE_CLIENT_SECRET: str = os.getenv("GOOGLE_CLIENT_SECRET")
+    GOOGLE_CLIENT_ID: Optional[str] = field(default_factory=lambda: os.getenv("GOOGLE_CLIENT_ID"))
+    GOOGLE_CLIENT_SECRET: Optional[str] = field(default_factory=lambda: os.getenv("GOOGLE_CLIENT_SECRET"))
 
-settings = Settings() 
\ No newline at end of file
+settings = Settings()
@@ -1,5 +1,5 @@
-from datetime import datetime, timedelta
-from typing import Optional
+from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
 import jwt
 from fastapi import HTTPException, status
 from google.oauth2 import id_token
@@ -7,19 +7,29 @@ from google.auth.transport import requests
 
 from .config import settings
 
-def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> str:
+# Shared HTTP transport so certificate fetches reuse pooled connections
+GOOGLE_REQUEST = requests.Request()
+
+# Signing parameters are fixed for the life of the process
+JWT_KEY = settings.JWT_SECRET_KEY
+JWT_ALGORITHM = settings.JWT_ALGORITHM
+JWT_ALGORITHMS = [JWT_ALGORITHM]
+
+# Token lifetimes
+DEFAULT_TOKEN_TTL = timedelta(minutes=15)
+ACCESS_TOKEN_TTL = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
+
+def create_access_token(data: dict, expires_delta: Optional[timedelta] = None) -> Tuple[str, datetime]:
+    """Return the encoded token and its (timezone-aware UTC) expiry time."""
+    expire = datetime.now(timezone.utc) + (expires_delta or DEFAULT_TOKEN_TTL)
     to_encode = data.copy()
-    if expires_delta:
-        expire = datetime.utcnow() + expires_delta
-    else:
-        expire = datetime.utcnow() + timedelta(minutes=15)
-    to_encode.update({"exp": expire})
-    encoded_jwt = jwt.encode(to_encode, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM)
-    return encoded_jwt
+    to_encode["exp"] = expire
+    encoded_jwt = jwt.encode(to_encode, JWT_KEY, algorithm=JWT_ALGORITHM)
+    return encoded_jwt, expire
 
 def verify_token(token: str) -> dict:
     try:
-        payload = jwt.decode(token, settings.JWT_SECRET_KEY, algorithms=[settings.JWT_ALGORITHM])
+        payload = jwt.decode(token, JWT_KEY, algorithms=JWT_ALGORITHMS)
         return payload
     except jwt.PyJWTError:
         raise HTTPException(
@@ -31,7 +41,7 @@ def verify_token(token: str) -> dict:
 def verify_google_token(token: str) -> dict:
     try:
         idinfo = id_token.verify_oauth2_token(
-            token, requests.Request(), settings.GOOGLE_CLIENT_ID
+            token, GOOGLE_REQUEST, settings.GOOGLE_CLIENT_ID
         )
         return idinfo
     except ValueError as e:
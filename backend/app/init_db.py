@@ -0,0 +1,15 @@
+"""
+Create the database tables.
+
+Run once per deployment, before starting the API workers:
+
+    python -m app.init_db
+"""
+from . import models
+from .database import engine
+
+def init_db():
+    models.Base.metadata.create_all(bind=engine)
+
+if __name__ == "__main__":
+    init_db()
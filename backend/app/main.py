@@ -1,26 +1,47 @@
-from fastapi import FastAPI, Depends, HTTPException, status
+from fastapi import FastAPI, Depends, HTTPException, Request, Response, status
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.middleware.gzip import GZipMiddleware
+from fastapi.responses import ORJSONResponse
+from sqlalchemy import bindparam, select, update
 from sqlalchemy.orm import Session
-from datetime import timedelta, datetime
+from datetime import datetime
 import uuid
 import logging
 
 from .core.config import settings
-from .core.security import create_access_token, verify_google_token
+from .core.security import ACCESS_TOKEN_TTL, create_access_token, verify_google_token
 from .api.deps import get_current_user
 from . import models, schemas
-from .database import engine, get_db
+from .database import get_db
+from .init_db import init_db
 
 # Configure logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# Create database tables
-models.Base.metadata.create_all(bind=engine)
+# Statements reused on every login
+USER_BY_EMAIL = select(models.User).where(models.User.email == bindparam("email"))
+
+# Clients may keep GET responses but must revalidate them with the ETag
+CACHE_CONTROL = "private, no-cache"
+
+def cache_headers(*rows) -> dict:
+    """Build a weak ETag from the id and last update time of each row."""
+    version = "-".join(f"{row.id}:{row.updated_at.timestamp():.6f}" for row in rows)
+    return {"ETag": f'W/"{version}"', "Cache-Control": CACHE_CONTROL}
+
+def etag_matches(request: Request, etag: str) -> bool:
+    """Weakly compare etag against every tag listed in If-None-Match (or "*")."""
+    header = request.headers.get("if-none-match")
+    if not header:
+        return False
+    tags = {tag.strip().removeprefix("W/") for tag in header.split(",")}
+    return "*" in tags or etag.removeprefix("W/") in tags
 
 app = FastAPI(
     title=settings.PROJECT_NAME,
     version=settings.VERSION,
+    default_response_class=ORJSONResponse,
 )
 
 # Configure CORS
@@ -32,6 +53,14 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# Compress larger JSON responses
+app.add_middleware(GZipMiddleware, minimum_size=500, compresslevel=5)
+
+@app.on_event("startup")
+def create_tables():
+    if settings.AUTO_CREATE_TABLES:
+        init_db()
+
 @app.get("/")
 async def root():
     return {"message": f"Welcome to {settings.PROJECT_NAME}"}
@@ -41,20 +70,20 @@ async def health_check():
     return {"status": "healthy"}
 
 @app.post("/auth/google")
-async def google_auth(request: schemas.GoogleAuthRequest, db: Session = Depends(get_db)):
+def google_auth(request: schemas.GoogleAuthRequest, db: Session = Depends(get_db)):
     try:
         # Verify the token
         idinfo = verify_google_token(request.credential)
-        logger.info(f"Google token verified for email: {idinfo['email']}")
+        logger.info("Google token verified for email: %s", idinfo['email'])
 
         # Check if user exists
-        user = db.query(models.User).filter(models.User.email == idinfo["email"]).first()
+        user = db.execute(USER_BY_EMAIL, {"email": idinfo["email"]}).scalars().first()
         
         if not user:
-            logger.info(f"Creating new user for email: {idinfo['email']}")
+            logger.info("Creating new user for email: %s", idinfo['email'])
             # Create new user
             user = models.User(
-                id=str(uuid.uuid4()),
+                id=uuid.uuid4().hex,
                 email=idinfo["email"],
                 name=idinfo["name"],
                 picture=idinfo.get("picture", ""),
@@ -63,52 +92,38 @@ async def google_auth(request: schemas.GoogleAuthRequest, db: Session = Depends(
             db.add(user)
             
             # Create user profile
-            profile = models.UserProfile(
-                id=str(uuid.uuid4()),
+            user.profile = models.UserProfile(
+                id=uuid.uuid4().hex,
                 user_id=user.id
             )
-            db.add(profile)
-            db.commit()
-            db.refresh(user)
-            db.refresh(profile)
-            logger.info(f"Created new user and profile for {user.email}")
         else:
-            logger.info(f"Existing user found: {user.email}")
+            logger.info("Existing user found: %s", user.email)
             # Ensure profile exists for existing user
             if not user.profile:
-                logger.info(f"Creating missing profile for existing user: {user.email}")
-                profile = models.UserProfile(
-                    id=str(uuid.uuid4()),
+                logger.info("Creating missing profile for existing user: %s", user.email)
+                user.profile = models.UserProfile(
+                    id=uuid.uuid4().hex,
                     user_id=user.id
                 )
-                db.add(profile)
-                db.commit()
-                db.refresh(user)
             else:
-                logger.info(f"Using existing profile for user: {user.email}")
-                profile = user.profile
+                logger.info("Using existing profile for user: %s", user.email)
 
         # Generate access token
-        access_token_expires = timedelta(minutes=settings.ACCESS_TOKEN_EXPIRE_MINUTES)
-        expires_at = datetime.utcnow() + access_token_expires
-        access_token = create_access_token(
-            data={"sub": user.id}, expires_delta=access_token_expires
+        access_token, expires_at = create_access_token(
+            data={"sub": user.id}, expires_delta=ACCESS_TOKEN_TTL
         )
-        logger.info(f"Generated access token for user: {user.email}")
+        logger.info("Generated access token for user: %s", user.email)
 
-        # Create or update session
+        # Create the session; user, profile and session are written in one transaction
         session = models.Session(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4().hex,
             user_id=user.id,
             token=access_token,
-            expires_at=expires_at
+            expires_at=expires_at.replace(tzinfo=None)  # column holds naive UTC
         )
         db.add(session)
         db.commit()
-        logger.info(f"Created new session for user: {user.email}")
-
-        # Ensure we have the latest user data
-        db.refresh(user)
+        logger.info("Created new session for user: %s", user.email)
         
         # Log the response data
         response_data = {
@@ -127,82 +142,106 @@ async def google_auth(request: schemas.GoogleAuthRequest, db: Session = Depends(
                 } if user.profile else None
             }
         }
-        logger.info(f"Returning response data for user {user.email}: {response_data}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Returning response data for user %s: %s", user.email, response_data)
         return response_data
 
     except Exception as e:
-        logger.error(f"Error in google_auth: {str(e)}")
+        logger.error("Error in google_auth: %s", e)
         raise HTTPException(status_code=500, detail=str(e))
 
 @app.get("/users/me", response_model=schemas.User)
-async def read_users_me(
+def read_users_me(
+    request: Request,
+    response: Response,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    logger.info(f"Fetching user data for: {current_user.email}")
+    logger.info("Fetching user data for: %s", current_user.email)
     # Ensure profile exists
     if not current_user.profile:
-        logger.info(f"Creating missing profile for user: {current_user.email}")
+        logger.info("Creating missing profile for user: %s", current_user.email)
         profile = models.UserProfile(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4().hex,
             user_id=current_user.id
         )
         db.add(profile)
+        current_user.profile = profile
         db.commit()
-        db.refresh(current_user)
     
+    headers = cache_headers(current_user, current_user.profile)
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
+
     # Log the response data
-    logger.info(f"User data: {current_user.email}, Profile: {current_user.profile.__dict__ if current_user.profile else None}")
+    logger.debug("User data: %s, Profile: %s", current_user.email, current_user.profile.__dict__ if current_user.profile else None)
     return current_user
 
 @app.put("/users/me", response_model=schemas.User)
-async def update_user_me(
+def update_user_me(
     user_update: schemas.UserUpdate,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    for key, value in user_update.dict(exclude_unset=True).items():
-        setattr(current_user, key, value)
-    db.commit()
-    db.refresh(current_user)
+    changes = {key: getattr(user_update, key) for key in user_update.__fields_set__}
+    if changes:
+        # One UPDATE statement; "evaluate" applies the same values to current_user
+        db.execute(
+            update(models.User)
+            .where(models.User.id == current_user.id)
+            .values(**changes, updated_at=datetime.utcnow()),
+            execution_options={"synchronize_session": "evaluate"},
+        )
+        db.commit()
     return current_user
 
 @app.get("/users/me/profile", response_model=schemas.UserProfile)
-async def read_user_profile(current_user: models.User = Depends(get_current_user)):
+def read_user_profile(
+    request: Request,
+    response: Response,
+    current_user: models.User = Depends(get_current_user)
+):
     if not current_user.profile:
         raise HTTPException(status_code=404, detail="Profile not found")
+
+    headers = cache_headers(current_user.profile)
+    if etag_matches(request, headers["ETag"]):
+        return Response(status_code=status.HTTP_304_NOT_MODIFIED, headers=headers)
+    response.headers.update(headers)
     return current_user.profile
 
 @app.put("/users/me/profile", response_model=schemas.UserProfile)
-async def update_user_profile(
+def update_user_profile(
     profile_update: schemas.UserProfileUpdate,
     current_user: models.User = Depends(get_current_user),
     db: Session = Depends(get_db)
 ):
-    logger.info(f"Updating profile for user: {current_user.email}")
-    logger.info(f"Update data: {profile_update.dict()}")
+    logger.info("Updating profile for user: %s", current_user.email)
+    if logger.isEnabledFor(logging.DEBUG):
+        logger.debug("Update data: %s", profile_update.dict())
     
     profile = current_user.profile
     if not profile:
-        logger.info(f"Creating new profile for user: {current_user.email}")
+        logger.info("Creating new profile for user: %s", current_user.email)
         profile = models.UserProfile(
-            id=str(uuid.uuid4()),
+            id=uuid.uuid4().hex,
             user_id=current_user.id
         )
         db.add(profile)
         current_user.profile = profile
     
     # Update profile fields
-    for key, value in profile_update.dict(exclude_unset=True).items():
-        logger.info(f"Setting {key} = {value}")
+    for key in profile_update.__fields_set__:
+        value = getattr(profile_update, key)
+        logger.debug("Setting %s = %s", key, value)
         setattr(profile, key, value)
     
     try:
         db.commit()
-        db.refresh(profile)
-        logger.info(f"Profile updated successfully: {profile.__dict__}")
+        logger.debug("Profile updated successfully: %s", profile.__dict__)
         return profile
     except Exception as e:
-        logger.error(f"Error updating profile: {str(e)}")
+        logger.error("Error updating profile: %s", e)
         db.rollback()
         raise HTTPException(status_code=500, detail="Failed to update profile") 
\ No newline at end of file
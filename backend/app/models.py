@@ -3,10 +3,13 @@ from sqlalchemy.orm import relationship
 from datetime import datetime
 from .database import Base
 
+# Fits both hex (32) and legacy dashed (36) UUID strings
+ID_LENGTH = 36
+
 class User(Base):
     __tablename__ = "users"
 
-    id = Column(String, primary_key=True)
+    id = Column(String(ID_LENGTH), primary_key=True)
     email = Column(String, unique=True, index=True)
     name = Column(String)
     picture = Column(String, nullable=True)
@@ -15,14 +18,14 @@ class User(Base):
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
     # Relationships
-    profile = relationship("UserProfile", back_populates="user", uselist=False)
+    profile = relationship("UserProfile", back_populates="user", uselist=False, lazy="joined")
     sessions = relationship("Session", back_populates="user")
 
 class UserProfile(Base):
     __tablename__ = "user_profiles"
 
-    id = Column(String, primary_key=True)
-    user_id = Column(String, ForeignKey("users.id"))
+    id = Column(String(ID_LENGTH), primary_key=True)
+    user_id = Column(String(ID_LENGTH), ForeignKey("users.id"), index=True, unique=True)
     address = Column(String, nullable=True)
     phone = Column(String, nullable=True)
     bio = Column(String, nullable=True)
@@ -35,10 +38,10 @@ class UserProfile(Base):
 class Session(Base):
     __tablename__ = "sessions"
 
-    id = Column(String, primary_key=True)
-    user_id = Column(String, ForeignKey("users.id"))
-    token = Column(String)
-    expires_at = Column(DateTime)
+    id = Column(String(ID_LENGTH), primary_key=True)
+    user_id = Column(String(ID_LENGTH), ForeignKey("users.id"), index=True)
+    token = Column(String(512), index=True)
+    expires_at = Column(DateTime, index=True)
     created_at = Column(DateTime, default=datetime.utcnow)
     updated_at = Column(DateTime, default=datetime.utcnow, onupdate=datetime.utcnow)
 
@@ -1,48 +1,90 @@
+import os
+import uuid
+from types import MappingProxyType
+
 import pytest
 from fastapi.testclient import TestClient
-from sqlalchemy import create_engine
+from sqlalchemy import create_engine, event
 from sqlalchemy.orm import sessionmaker
 from sqlalchemy.pool import StaticPool
 
-from app.database import Base
-from app.main import app, get_db
+# Settings require a signing key at import time, and the app's own engine is
+# never used by the tests, so keep it off the PostgreSQL driver
+os.environ.setdefault("JWT_SECRET_KEY", "test-secret-key")
+os.environ.setdefault("DATABASE_URL", "sqlite://")
 
 # Create test database
-SQLALCHEMY_DATABASE_URL = "sqlite://"  # In-memory SQLite database for testing
+# In-memory SQLite database for testing; private to each process, so every
+# pytest-xdist worker gets its own database
+SQLALCHEMY_DATABASE_URL = "sqlite://"
 
 engine = create_engine(
     SQLALCHEMY_DATABASE_URL,
     connect_args={"check_same_thread": False},
     poolclass=StaticPool,
 )
+
+# pysqlite's own transaction handling breaks SAVEPOINT; let SQLAlchemy emit BEGIN
+@event.listens_for(engine, "connect")
+def _disable_pysqlite_transactions(dbapi_connection, connection_record):
+    dbapi_connection.isolation_level = None
+
+@event.listens_for(engine, "begin")
+def _emit_begin(conn):
+    conn.exec_driver_sql("BEGIN")
+
 TestingSessionLocal = sessionmaker(autocommit=False, autoflush=False, bind=engine)
 
-@pytest.fixture(scope="function")
-def db_session():
-    Base.metadata.create_all(bind=engine)
+def override_get_db():
     db = TestingSessionLocal()
     try:
         yield db
     finally:
         db.close()
-        Base.metadata.drop_all(bind=engine)
-
-@pytest.fixture(scope="function")
-def client(db_session):
-    def override_get_db():
-        try:
-            yield db_session
-        finally:
-            db_session.close()
-    
+
+@pytest.fixture(scope="session")
+def _engine():
+    # The app is imported here, not at module level, so unit tests never load it;
+    # app.models registers the tables on Base.metadata
+    from app import models  # noqa: F401
+    from app.database import Base
+
+    # Schema is created once for the whole run; tests roll back their rows
+    Base.metadata.create_all(bind=engine)
+    yield engine
+    Base.metadata.drop_all(bind=engine)
+
+@pytest.fixture(autouse=True)
+def db_connection(request):
+    """Run each database test inside a transaction that is rolled back afterwards."""
+    if "_engine" not in request.fixturenames:
+        yield None
+        return
+
+    connection = request.getfixturevalue("_engine").connect()
+    transaction = connection.begin()
+    # Session commits only release a SAVEPOINT inside the outer transaction
+    TestingSessionLocal.configure(bind=connection, join_transaction_mode="create_savepoint")
+    try:
+        yield connection
+    finally:
+        transaction.rollback()
+        connection.close()
+        TestingSessionLocal.configure(bind=engine, join_transaction_mode="conservative_savepoint")
+
+@pytest.fixture(scope="session")
+def client(_engine):
+    from app.main import app, get_db
+
     app.dependency_overrides[get_db] = override_get_db
     with TestClient(app) as test_client:
         yield test_client
     app.dependency_overrides.clear()
 
-@pytest.fixture
-def sample_user_data():
-    return {
+@pytest.fixture(scope="module")
+def base_user_payload():
+    # Read-only template; tests build variants with {**base_user_payload, ...}
+    return MappingProxyType({
         "email": "test@example.com",
         "username": "testuser",
         "password": "password123",
@@ -51,9 +93,31 @@ def sample_user_data():
         "state": "TS",
         "country": "Test Country",
         "postal_code": "12345"
-    }
+    })
+
+@pytest.fixture
+def sample_user_data(base_user_payload):
+    return dict(base_user_payload)
 
 @pytest.fixture
 def created_user(client, sample_user_data):
     response = client.post("/users/", json=sample_user_data)
-    return response.json() 
\ No newline at end of file
+    return response.json()
+
+@pytest.fixture
+def auth_headers(client):
+    """Bearer headers for a freshly inserted user with an empty profile."""
+    from app import models
+    from app.core.security import create_access_token
+
+    db = TestingSessionLocal()
+    try:
+        user = models.User(id=uuid.uuid4().hex, email="me@example.com", name="Test User")
+        user.profile = models.UserProfile(id=uuid.uuid4().hex)
+        db.add(user)
+        db.commit()
+        user_id = user.id
+    finally:
+        db.close()
+    token, _ = create_access_token(data={"sub": user_id})
+    return {"Authorization": f"Bearer {token}"}
@@ -1,6 +1,8 @@
 import pytest
 from fastapi import status
 
+pytestmark = pytest.mark.integration
+
 def test_create_user_success(client, sample_user_data):
     response = client.post("/users/", json=sample_user_data)
     assert response.status_code == status.HTTP_201_CREATED
@@ -12,39 +14,19 @@ def test_create_user_success(client, sample_user_data):
     assert "password" not in data
     assert "hashed_password" not in data
 
-def test_create_user_duplicate_email(client, created_user, sample_user_data):
-    response = client.post("/users/", json=sample_user_data)
-    assert response.status_code == status.HTTP_400_BAD_REQUEST
-    assert response.json()["detail"] == "Email already registered"
-
-def test_create_user_duplicate_username(client, created_user):
-    new_user_data = {
-        "email": "another@example.com",
-        "username": "testuser",  # Same username as created_user
-        "password": "password123",
-        "street_address": "456 Test St",
-        "city": "Test City",
-        "state": "TS",
-        "country": "Test Country",
-        "postal_code": "12345"
-    }
-    response = client.post("/users/", json=new_user_data)
-    assert response.status_code == status.HTTP_400_BAD_REQUEST
-    assert response.json()["detail"] == "Username already taken"
-
-def test_create_user_invalid_password(client):
-    invalid_user_data = {
-        "email": "test@example.com",
-        "username": "testuser",
-        "password": "short",  # Less than 8 characters
-        "street_address": "123 Test St",
-        "city": "Test City",
-        "state": "TS",
-        "country": "Test Country",
-        "postal_code": "12345"
-    }
-    response = client.post("/users/", json=invalid_user_data)
-    assert response.status_code == status.HTTP_422_UNPROCESSABLE_ENTITY
+@pytest.mark.parametrize("overrides, status_code, detail", [
+    ({}, status.HTTP_400_BAD_REQUEST, "Email already registered"),
+    # Same username as created_user
+    ({"email": "another@example.com", "street_address": "456 Test St"},
+     status.HTTP_400_BAD_REQUEST, "Username already taken"),
+    # Less than 8 characters
+    ({"password": "short"}, status.HTTP_422_UNPROCESSABLE_ENTITY, None),
+])
+def test_create_user_validation(client, created_user, base_user_payload, overrides, status_code, detail):
+    response = client.post("/users/", json={**base_user_payload, **overrides})
+    assert response.status_code == status_code
+    if detail is not None:
+        assert response.json()["detail"] == detail
 
 def test_get_users_empty(client):
     response = client.get("/users/")
@@ -95,17 +77,13 @@ def test_update_user_not_found(client):
     response = client.put("/users/999", json={"email": "test@example.com"})
     assert response.status_code == status.HTTP_404_NOT_FOUND
 
-def test_update_user_duplicate_email(client, created_user):
+def test_update_user_duplicate_email(client, created_user, base_user_payload):
     # Create another user first
     another_user = {
+        **base_user_payload,
         "email": "another@example.com",
         "username": "anotheruser",
-        "password": "password123",
         "street_address": "456 Test St",
-        "city": "Test City",
-        "state": "TS",
-        "country": "Test Country",
-        "postal_code": "12345"
     }
     client.post("/users/", json=another_user)
     
@@ -127,4 +105,44 @@ def test_delete_user_success(client, created_user):
 
 def test_delete_user_not_found(client):
     response = client.delete("/users/999")
-    assert response.status_code == status.HTTP_404_NOT_FOUND 
\ No newline at end of file
+    assert response.status_code == status.HTTP_404_NOT_FOUND
+
+@pytest.mark.parametrize("path, update", [
+    ("/users/me", {"name": "Renamed User"}),
+    ("/users/me/profile", {"bio": "Updated bio"}),
+], ids=["user", "profile"])
+def test_etag_revalidation(client, auth_headers, path, update):
+    response = client.get(path, headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    etag = response.headers["ETag"]
+
+    for if_none_match in (etag, f'W/"stale", {etag}', "*"):
+        response = client.get(path, headers={**auth_headers, "If-None-Match": if_none_match})
+        assert response.status_code == status.HTTP_304_NOT_MODIFIED
+        assert response.headers["ETag"] == etag
+
+    assert client.put(path, json=update, headers=auth_headers).status_code == status.HTTP_200_OK
+    response = client.get(path, headers={**auth_headers, "If-None-Match": etag})
+    assert response.status_code == status.HTTP_200_OK
+    assert response.headers["ETag"] != etag
+
+def test_update_me_partial(client, auth_headers):
+    before = client.get("/users/me", headers=auth_headers).json()
+
+    response = client.put("/users/me", json={"name": "Renamed User"}, headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    updated = response.json()
+    assert updated["name"] == "Renamed User"
+    assert updated["email"] == before["email"]  # Unchanged field
+    assert updated["updated_at"] != before["updated_at"]
+
+    assert client.get("/users/me", headers=auth_headers).json() == updated
+
+def test_update_me_empty_body(client, auth_headers):
+    before = client.get("/users/me", headers=auth_headers).json()
+
+    # No fields set, so no UPDATE is issued and updated_at stays put
+    response = client.put("/users/me", json={}, headers=auth_headers)
+    assert response.status_code == status.HTTP_200_OK
+    assert response.json() == before
+    assert client.get("/users/me", headers=auth_headers).json() == before
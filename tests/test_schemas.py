@@ -3,49 +3,18 @@ from pydantic import ValidationError
 from app.schemas import UserCreate, UserUpdate, User
 from datetime import datetime
 
-def test_user_create_valid():
-    user_data = {
-        "email": "test@example.com",
-        "username": "testuser",
-        "password": "password123",
-        "street_address": "123 Test St",
-        "city": "Test City",
-        "state": "TS",
-        "country": "Test Country",
-        "postal_code": "12345"
-    }
+pytestmark = pytest.mark.unit
+
+_FIXED_DT = datetime(2024, 1, 1, 12, 0, 0)
+
+def test_user_create_valid(base_user_payload):
+    user_data = dict(base_user_payload)
     user = UserCreate(**user_data)
     assert user.email == user_data["email"]
     assert user.username == user_data["username"]
     assert user.password == user_data["password"]
     assert user.street_address == user_data["street_address"]
 
-def test_user_create_invalid_email():
-    with pytest.raises(ValidationError):
-        UserCreate(
-            email="invalid-email",
-            username="testuser",
-            password="password123",
-            street_address="123 Test St",
-            city="Test City",
-            state="TS",
-            country="Test Country",
-            postal_code="12345"
-        )
-
-def test_user_create_short_password():
-    with pytest.raises(ValidationError):
-        UserCreate(
-            email="test@example.com",
-            username="testuser",
-            password="short",
-            street_address="123 Test St",
-            city="Test City",
-            state="TS",
-            country="Test Country",
-            postal_code="12345"
-        )
-
 def test_user_update_partial():
     update_data = {
         "email": "updated@example.com",
@@ -57,9 +26,15 @@ def test_user_update_partial():
     assert user_update.username is None
     assert user_update.password is None
 
-def test_user_update_invalid_email():
-    with pytest.raises(ValidationError):
-        UserUpdate(email="invalid-email")
+@pytest.mark.parametrize("model_cls, overrides, field", [
+    (UserCreate, {"email": "invalid-email"}, "email"),
+    (UserUpdate, {"is_active": "not-a-bool"}, "is_active"),
+    (UserUpdate, {"name": ["not", "a", "string"]}, "name"),
+], ids=["create-invalid-email", "update-invalid-is-active", "update-invalid-name"])
+def test_validation_errors(base_user_payload, model_cls, overrides, field):
+    with pytest.raises(ValidationError) as exc_info:
+        model_cls(**{**base_user_payload, **overrides})
+    assert (field,) in [error["loc"] for error in exc_info.value.errors()]
 
 def test_user_model_complete():
     user_data = {
@@ -72,8 +47,8 @@ def test_user_model_complete():
         "country": "Test Country",
         "postal_code": "12345",
         "is_active": True,
-        "created_at": datetime.now(),
-        "updated_at": datetime.now()
+        "created_at": _FIXED_DT,
+        "updated_at": _FIXED_DT
     }
     user = User(**user_data)
     assert user.id == user_data["id"]